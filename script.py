@@ -1,9 +1,279 @@
 import os
+import sys
 import re
+import argparse
+import io
 import gzip
+import zlib
+import heapq
+import bisect
+import calendar
+import mmap
+import hashlib
 import shutil
+import subprocess
+import functools
 import contextlib
-from datetime import datetime
+import itertools
+import collections
+import multiprocessing
+import operator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    # python-isal is a drop-in for gzip.open with a much faster inflate
+    from isal import igzip as gzip_reader
+except ImportError:
+    gzip_reader = gzip
+
+# Copy size used when inflating archives in-process (default is only 16 KB).
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Write buffer for the report files
+REPORT_BUFFER_SIZE = 1024 * 1024
+
+
+def find_gunzip_command():
+    """
+    Returns the command prefix of the fastest external gunzip available,
+    or None if only the in-process gzip module can be used.
+    """
+    for tool, args in (("libdeflate-gunzip", ["-k"]), ("pigz", ["-d", "-k"]), ("gunzip", ["-k"])):
+        tool_path = shutil.which(tool)
+        if tool_path:
+            return [tool_path] + args
+    return None
+
+GUNZIP_COMMAND = find_gunzip_command()
+
+# Set OSW_EXTRACT_ARCHIVES=0 to analyze .gz files in place instead of unzipping them first
+EXTRACT_ARCHIVES = os.environ.get("OSW_EXTRACT_ARCHIVES", "1") != "0"
+
+# Set OSW_PARALLEL_ANALYSES=0 to run the "Run All" analyses one after another in this process
+PARALLEL_ANALYSES = os.environ.get("OSW_PARALLEL_ANALYSES", "1") != "0"
+
+# Set OSW_REPORT_CACHE=1 to keep finished reports (gzipped) in this directory under the
+# archive and reuse them while their input files are unchanged; off by default so
+# nothing is written into the archive beyond the reports themselves
+REPORT_CACHE = os.environ.get("OSW_REPORT_CACHE", "0") == "1"
+REPORT_CACHE_DIR_NAME = ".osw_report_cache"
+REPORT_CACHE_ENTRIES = 32
+
+# Bytes read from the top of a vmstat file when looking for the core count header
+VMSTAT_HEAD_READ_SIZE = 64 * 1024
+
+# Regexes used in the per-line parsing loops, compiled once at import
+OSWTOP_LOAD_RE = re.compile(rb"^top - (\d{2}:\d{2}:\d{2}) .*load average: ([\d.]+), ([\d.]+), ([\d.]+)")
+TOP_TIMESTAMP_HEADER_RE = re.compile(rb'^zzz \*\*\*(.*?)$')
+TOP_PROCESS_LINE_RE = re.compile(
+    rb'^\s*(\d+)\s+(\S+)\s+\d+\s+\S+\s+\S+\s+\S+\s+\S+\s+([RSDZTW])\s+([\d.]+)\s+([\d.]+)\s+[\d:.]+\s+(.+)$'
+)
+# Lines the netstat parser acts on: "zzz"/"***" timestamps, "2: eth0: ..." interface lines and
+# RX:/TX: counter headers (leading whitespace allowed on the last two, as after strip())
+NETSTAT_LINE_RE = re.compile(
+    rb"^(?:(?P<ts>(?:zzz|\*\*\*).*)"
+    rb"|[ \t\r\v\f]*\d+:[ \t\r\v\f]+(?P<iface>[^:\n]+):"
+    rb"|[ \t\r\v\f]*(?P<direction>[RT]X):)",
+    re.MULTILINE,
+)
+# Netstat directions: matched header -> (direction, packets key, drops key) in the snapshot records
+NETSTAT_DIRECTIONS = {
+    b"RX": ("RX", "rx_pkts", "rx_drops"),
+    b"TX": ("TX", "tx_pkts", "tx_drops"),
+}
+# Netstat per-interface totals for each direction: (packets, drops, worst pct, worst timestamp)
+NETSTAT_STATS_KEYS = {
+    "RX": ("total_rx_packets", "total_rx_drops", "worst_rx_pct", "worst_rx_ts"),
+    "TX": ("total_tx_packets", "total_tx_drops", "worst_tx_pct", "worst_tx_ts"),
+}
+TIMESTAMP_KEY_RE = re.compile(r"(\d\d)\.(\d\d)\.(\d\d)\.(\d\d)(\d\d)")
+
+# First characters of the iostat section lines: zzz/*** timestamps, avg-cpu:, Device header
+IOSTAT_MARKER_INITIALS = frozenset(b"z*aD")
+
+# meminfo keys used for the memory calculation -> slot in process_oswmeminfo_files' values list
+MEMINFO_SLOTS = {b"MemTotal": 0, b"MemFree": 1, b"Buffers": 2, b"Cached": 3}
+# Finds, in one pass over a whole meminfo file, each "zzz " header line and the first
+# value token of each wanted key; every other line is skipped inside the regex engine
+MEMINFO_LINE_RE = re.compile(rb"^(?:(zzz .*)|(MemTotal|MemFree|Buffers|Cached):[^\S\n]*(\S*))", re.MULTILINE)
+
+# Result of the last scan_oswtop_files() call, keyed by (directory, dat_file_stats())
+OSWTOP_SCAN_CACHE = {}
+
+# directory -> (mtime_ns, sorted .dat names); see list_dat_files()
+DAT_LISTING_CACHE = {}
+
+# directory -> (mtime_ns, timestamp keys, names) in timestamp order; see build_time_index()
+TIME_INDEX_CACHE = {}
+
+
+def list_dat_files(directory):
+    """
+    Returns the sorted .dat file names in directory using a single os.scandir pass.
+    Archives that are still compressed (name.dat.gz) are listed under their .dat name;
+    open_dat_file() reads them in place.
+    The listing is cached per directory and reused until the directory mtime changes,
+    so repeated analyses over the same archive do not rescan it.
+    """
+    mtime_ns = os.stat(directory).st_mtime_ns
+    cached = DAT_LISTING_CACHE.get(directory)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    names = set()
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(".dat.gz"):
+                name = name[:-3]
+            elif not name.endswith(".dat"):
+                continue
+            if entry.is_file():  # Follows symlinks, as archives may link their .dat files
+                names.add(name)
+    names = sorted(names)
+    DAT_LISTING_CACHE[directory] = (mtime_ns, names)
+    return names
+
+
+def dat_file_stats(directory, names):
+    """
+    Returns (name, size, mtime_ns) for each of names in directory, taken from the
+    .gz when the file is still compressed. OSWatcher keeps appending to the current
+    file without touching the directory mtime, so caches of parsed data key on this.
+    """
+    stats = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = os.stat(path + ".gz")  # Still compressed; read in place
+        stats.append((name, st.st_size, st.st_mtime_ns))
+    return tuple(stats)
+
+
+def open_dat_file(filepath, mode="rb", **kwargs):
+    """
+    Opens an OSWatcher .dat file. If it has not been extracted, the .gz next to it
+    is decompressed on the fly instead, so analyses can run without unzipping first.
+    """
+    if not os.path.exists(filepath) and os.path.exists(filepath + ".gz"):
+        if "b" not in mode and "t" not in mode:
+            mode += "t"
+        return gzip_reader.open(filepath + ".gz", mode, **kwargs)
+    return open(filepath, mode, **kwargs)
+
+
+@contextlib.contextmanager
+def mapped_file(filepath):
+    """
+    Context manager yielding a read-only mmap of filepath (b"" for an empty file),
+    with the kernel hinted for sequential access.
+    """
+    if not os.path.exists(filepath):
+        # Not extracted yet: inflate the .gz into memory instead
+        with open_dat_file(filepath) as f:
+            yield f.read()
+        return
+
+    with open(filepath, "rb") as f:
+        fd = f.fileno()
+        if os.fstat(fd).st_size == 0:
+            yield b""  # mmap cannot map an empty file
+            return
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield mm
+
+def advise_will_need(filepath):
+    """
+    Asks the kernel to start reading filepath into the page cache in the background,
+    so a later mapped_file() finds it there. Does nothing for a file that is only
+    present as .gz, or where posix_fadvise is not available.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+def read_dat_file(filepath):
+    """
+    Returns the whole contents of a .dat file as bytes (inflating the .gz if not extracted).
+    Extracted files get the same sequential-access hint as mapped_file().
+    """
+    with open_dat_file(filepath) as f:
+        if isinstance(f, io.BufferedReader) and hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return f.read()
+
+def prefetch_dat_files(filepaths, max_workers=4, max_inflight=8):
+    """
+    Yields the contents of filepaths in order while a small thread pool reads the
+    following files, so disk reads (and gzip inflate, which releases the GIL) overlap
+    with parsing of the current file. At most max_inflight files are held at once.
+    """
+    paths = iter(filepaths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque(executor.submit(read_dat_file, path)
+                                    for path in itertools.islice(paths, max_inflight))
+        while pending:
+            future = pending.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append(executor.submit(read_dat_file, next_path))
+            yield future.result()
+
+def timestamp_key(timestamp_str):
+    """
+    Converts a yy.mm.dd.hhmm string into a (year, month, day, hour, minute) tuple
+    that compares like the datetime would, without the cost of datetime.strptime.
+    Returns None if the string is not in that format.
+    """
+    match = TIMESTAMP_KEY_RE.fullmatch(timestamp_str)
+    if not match:
+        return None
+    yy, month, day, hour, minute = map(int, match.groups())
+    # Same century pivot as strptime's %y
+    year = 2000 + yy if yy < 69 else 1900 + yy
+    if not (1 <= month <= 12 and hour <= 23 and minute <= 59):
+        return None
+    if not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+    return (year, month, day, hour, minute)
+
+def build_time_index(directory):
+    """
+    Returns (times, names) for the .dat files of directory, both ordered by the
+    (year, month, day, hour, minute) key of each filename timestamp, so a time range
+    maps to one slice found with two bisects. Files without a valid timestamp are
+    left out. Cached like list_dat_files() until the directory mtime changes.
+    """
+    mtime_ns = os.stat(directory).st_mtime_ns
+    cached = TIME_INDEX_CACHE.get(directory)
+    if cached and cached[0] == mtime_ns:
+        return cached[1], cached[2]
+
+    entries = []
+    for fname in list_dat_files(directory):
+        # Split on last "_" and strip .dat
+        ftime = timestamp_key(fname.rsplit("_", 1)[-1].replace(".dat", ""))
+        if ftime:
+            entries.append((ftime, fname))
+    entries.sort()
+    times = [ftime for ftime, _ in entries]
+    names = [fname for _, fname in entries]
+    TIME_INDEX_CACHE[directory] = (mtime_ns, times, names)
+    return times, names
 
 def filter_files_by_timerange(directory, start_str, end_str):
     """
@@ -11,26 +281,17 @@ def filter_files_by_timerange(directory, start_str, end_str):
     Expected format: yy.mm.dd.hhmm (e.g., 25.09.08.0100)
     Works for oswtop, oswmeminfo, oswiostat, etc.
     """
-    def parse_filename(filename):
-        try:
-            # Split on last "_" and strip .dat
-            timestamp_str = filename.rsplit("_", 1)[-1].replace(".dat", "")
-            return datetime.strptime(timestamp_str, "%y.%m.%d.%H%M")
-        except Exception:
-            return None
-
-    start_dt = datetime.strptime(start_str, "%y.%m.%d.%H%M")
-    end_dt   = datetime.strptime(end_str, "%y.%m.%d.%H%M")
+    start_key = timestamp_key(start_str)
+    end_key = timestamp_key(end_str)
+    if start_key is None or end_key is None:
+        raise ValueError(f"time range must be given as yy.mm.dd.hhmm, got: {start_str} - {end_str}")
 
-    filtered_files = []
-    for fname in sorted(os.listdir(directory)):
-        if fname.endswith(".dat"):
-            ftime = parse_filename(fname)
-            if ftime and start_dt <= ftime <= end_dt:
-                filtered_files.append(fname)
-
-    return filtered_files
+    times, names = build_time_index(directory)
+    first = bisect.bisect_left(times, start_key)
+    last = bisect.bisect_right(times, end_key)
 
+    # Keep the same (filename) order as the directory listing
+    return sorted(names[first:last])
 
 
 def get_oswarchive_path():
@@ -41,45 +302,187 @@ def get_oswarchive_path():
         else:
             print("Invalid directory path. Please try again.")
 
-def unzip_gz_files(directory, silent=True):
+def gunzip_file(gz_path, dat_path):
+    """
+    Decompresses gz_path to dat_path and removes the .gz afterwards.
+    Uses the external gunzip tool when present, otherwise inflates in-process.
+    """
+    if GUNZIP_COMMAND:
+        result = subprocess.run(GUNZIP_COMMAND + [gz_path],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if result.returncode == 0 and os.path.exists(dat_path):
+            os.remove(gz_path)
+            return
+        # Drop any partial output and retry in-process
+        if os.path.exists(dat_path):
+            os.remove(dat_path)
+
+    # Inflate into one reused buffer and write memoryview slices of it,
+    # so no new bytes object is created per chunk
+    buf = memoryview(bytearray(COPY_BUFFER_SIZE))
+    with gzip_reader.open(gz_path, 'rb') as f_in:
+        with open(dat_path, 'wb') as f_out:
+            while True:
+                n = f_in.readinto(buf)
+                if not n:
+                    break
+                f_out.write(buf[:n])
+    os.remove(gz_path)
+
+def gunzip_worker(gz_path):
+    """
+    Process-pool worker: decompresses one archive.
+    Returns (gz_path, error message or None) so failures can be reported by the parent.
+    """
+    try:
+        gunzip_file(gz_path, gz_path[:-3])
+        return gz_path, None
+    except Exception as e:
+        return gz_path, str(e)
+
+def collect_pending_gz_files(directory, silent=True):
+    """
+    Returns the .gz paths in directory whose .dat has not been extracted yet,
+    or None if the directory cannot be read.
+    """
     try:
-        files = os.listdir(directory)
+        with os.scandir(directory) as entries:
+            files = [(entry.name, entry.path) for entry in entries]
     except Exception as e:
         if not silent:
             print(f"Error accessing directory '{directory}': {e}")
-        return False  # Signal failure to calling function
+        return None
 
-    success = True
-    for file in files:
+    # Names from the same listing tell which archives are extracted already,
+    # so no per-file stat is needed
+    names = {name for name, _ in files}
+    pending = []
+    for file, gz_path in files:
         if file.endswith(".gz"):
-            gz_path = os.path.join(directory, file)
-            dat_path = gz_path[:-3]
-            if not os.path.exists(dat_path):
+            # Skip already extracted archives before they ever reach the pool
+            if file[:-3] not in names:
                 if not silent:
                     print(f"Unzipping: {file}")
-                try:
-                    with gzip.open(gz_path, 'rb') as f_in:
-                        with open(dat_path, 'wb') as f_out:
-                            shutil.copyfileobj(f_in, f_out)
-                    os.remove(gz_path)
-                except Exception as e:
-                    print(f"Error unzipping {file}: {e}")
-                    success = False  # One file failed, still keep going
+                pending.append(gz_path)
+    return pending
 
-    return success  # True if all/unzipped or already extracted, False if any error occurred
+def gunzip_in_parallel(gz_paths):
+    """
+    Decompresses the given archives across a process pool (one file per task).
+    Returns True if every file was extracted, False if any error occurred.
+    """
+    if not gz_paths:
+        return True
+
+    if len(gz_paths) == 1:
+        results = [gunzip_worker(gz_paths[0])]
+    else:
+        workers = min(os.cpu_count() or 1, len(gz_paths))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(gunzip_worker, gz_paths, chunksize=4))
+
+    success = True
+    for gz_path, error in results:
+        if error:
+            print(f"Error unzipping {os.path.basename(gz_path)}: {error}")
+            success = False  # One file failed, still keep going
+    return success
+
+def unzip_gz_files(directory, silent=True):
+    pending = collect_pending_gz_files(directory, silent)
+    if pending is None:
+        return False  # Signal failure to calling function
+
+    return gunzip_in_parallel(pending)  # True if all/unzipped or already extracted, False if any error occurred
 
 def prepare_all_archives(base_dir, subdirectories):
     """
     Checks and unzips files for all required OSWatcher subdirectories.
+    Archives from every subdirectory are decompressed together in one process pool.
     """
     print("Preparing all required archives...")
+    pending = []
     for subdir in subdirectories:
         full_path = os.path.join(base_dir, subdir)
         print(f"\n--- Checking '{subdir}' directory ---")
-        unzip_gz_files(full_path, silent=False)
+        pending.extend(collect_pending_gz_files(full_path, silent=False) or [])
+    gunzip_in_parallel(pending)
     print("\nAll archives are ready for analysis.")
 
 
+def report_cache_key(output_path, start_str, end_str, cache_inputs):
+    """
+    Hashes everything a report depends on: its name and time range, the analysis
+    parameters, this script's mtime, and the name, size and mtime of every input file.
+    cache_inputs is (directory, file_list, *parameters).
+    """
+    directory, file_list, *parameters = cache_inputs
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((os.path.basename(output_path), start_str, end_str, parameters,
+                        os.stat(__file__).st_mtime_ns)).encode())
+    for name, size, mtime_ns in dat_file_stats(directory, file_list if file_list else list_dat_files(directory)):
+        digest.update(f"{name}\0{size}\0{mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+def load_cached_report(cache_path):
+    """Returns the cached report bytes, or None if there is no usable entry."""
+    try:
+        with gzip.open(cache_path, "rb") as f:
+            report = f.read()
+    except (OSError, EOFError, zlib.error):
+        return None
+    os.utime(cache_path)  # Mark as recently used
+    return report
+
+def store_cached_report(cache_path, report):
+    """Writes a cache entry atomically and drops the least recently used ones past the limit."""
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with gzip.open(temp_path, "wb", compresslevel=1) as f:
+            f.write(report)
+        os.replace(temp_path, cache_path)
+
+        with os.scandir(cache_dir) as entries:
+            cached = sorted((entry.stat().st_mtime_ns, entry.path) for entry in entries
+                            if entry.name.endswith(".gz"))
+        for _, stale_path in cached[:-REPORT_CACHE_ENTRIES]:
+            os.remove(stale_path)
+    except OSError:
+        pass  # The cache is only an optimization; a read-only archive still gets its report
+
+def write_report(output_path, render, start_str=None, end_str=None, cache_inputs=None):
+    """
+    Calls render(out) with an in-memory buffer as the report stream, then writes the
+    whole report to output_path as a single encoded write through a 1 MiB buffered
+    binary file, instead of one small text write per line.
+    With cache_inputs (see report_cache_key), an unchanged report is copied from the
+    report cache instead of being rendered again. A freshly rendered report is only
+    stored if its input files did not change while it was rendered, so a cache entry
+    never holds output from data older or newer than its key.
+    """
+    report = cache_path = None
+    if REPORT_CACHE and cache_inputs is not None:
+        cache_key = report_cache_key(output_path, start_str, end_str, cache_inputs)
+        cache_path = os.path.join(os.path.dirname(output_path), REPORT_CACHE_DIR_NAME, cache_key + ".gz")
+        report = load_cached_report(cache_path)
+
+    if report is None:
+        buf = io.StringIO()
+        if start_str and end_str:
+            print(f"========== Custom Time Range Analysis ==========", file=buf)
+            print(f"Time Range: From {start_str} to {end_str}", file=buf)
+            print(f"Format: yy.mm.dd.hhmm\n", file=buf)
+        render(buf)
+        report = buf.getvalue().encode("utf-8")
+        if cache_path and report_cache_key(output_path, start_str, end_str, cache_inputs) == cache_key:
+            store_cached_report(cache_path, report)
+
+    with open(output_path, "wb", buffering=REPORT_BUFFER_SIZE) as f:
+        f.write(report)
+
+
 def run_cpu_analysis(file_list=None, output_suffix="", start_str=None, end_str=None):
     
     output_filename = f"cpu_analysis{output_suffix}.txt"
@@ -90,12 +493,8 @@ def run_cpu_analysis(file_list=None, output_suffix="", start_str=None, end_str=N
         return False
     threshold_75 = 0.75 * cpu_cores
 
-    with open(output_path, "w") as f, contextlib.redirect_stdout(f):
-        if start_str and end_str:
-            print(f"========== Custom Time Range Analysis ==========")
-            print(f"Time Range: From {start_str} to {end_str}")
-            print(f"Format: yy.mm.dd.hhmm\n")
-        process_oswtop_files(oswtop_dir, cpu_cores, threshold_75, file_list)
+    write_report(output_path, lambda out: process_oswtop_files(oswtop_dir, cpu_cores, threshold_75, file_list, out=out),
+                 start_str, end_str, cache_inputs=(oswtop_dir, file_list, cpu_cores))
 
     print(f"CPU analysis written to: {output_path}")
     return True
@@ -105,12 +504,8 @@ def run_memory_analysis(file_list=None, output_suffix="", start_str=None, end_st
     
     output_filename = f"memory_analysis{output_suffix}.txt"
     output_path = os.path.join(archive_dir, output_filename)
-    with open(output_path, "w") as f, contextlib.redirect_stdout(f):
-        if start_str and end_str:
-            print(f"========== Custom Time Range Analysis ==========")
-            print(f"Time Range: From {start_str} to {end_str}")
-            print(f"Format: yy.mm.dd.hhmm\n")
-        process_oswmeminfo_files(oswmeminfo_dir, file_list)
+    write_report(output_path, lambda out: process_oswmeminfo_files(oswmeminfo_dir, file_list, out=out),
+                 start_str, end_str, cache_inputs=(oswmeminfo_dir, file_list))
 
     print(f"Memory analysis written to: {output_path}")
     return True
@@ -125,12 +520,8 @@ def run_vmstat_analysis(file_list=None, output_suffix="", start_str=None, end_st
         print("Skipping VMStat analysis because CPU core count could not be determined.")
         return False
 
-    with open(output_path, "w") as f, contextlib.redirect_stdout(f):
-        if start_str and end_str:
-            print(f"========== Custom Time Range Analysis ==========")
-            print(f"Time Range: From {start_str} to {end_str}")
-            print(f"Format: yy.mm.dd.hhmm\n")
-        process_oswvmstat_files(oswvmstat_dir, cpu_cores, file_list)
+    write_report(output_path, lambda out: process_oswvmstat_files(oswvmstat_dir, cpu_cores, file_list, out=out),
+                 start_str, end_str, cache_inputs=(oswvmstat_dir, file_list, cpu_cores))
 
     print(f"vmstat analysis written to: {output_path}")
     return True
@@ -140,12 +531,8 @@ def run_dstate_analysis(file_list=None, output_suffix="", start_str=None, end_st
     
     output_filename = f"dstate_and_high_resource_processes{output_suffix}.txt"
     output_path = os.path.join(archive_dir, output_filename)
-    with open(output_path, "w") as f, contextlib.redirect_stdout(f):
-        if start_str and end_str:
-            print(f"========== Custom Time Range Analysis ==========")
-            print(f"Time Range: From {start_str} to {end_str}")
-            print(f"Format: yy.mm.dd.hhmm\n")
-        analyze_oswtop_data(oswtop_dir, file_list)
+    write_report(output_path, lambda out: analyze_oswtop_data(oswtop_dir, file_list, out=out),
+                 start_str, end_str, cache_inputs=(oswtop_dir, file_list))
 
     print(f"D-state and High Resource Process analysis written to: {output_path}")
     return True
@@ -155,12 +542,8 @@ def run_disk_analysis(file_list=None, output_suffix="", start_str=None, end_str=
     
     output_filename = f"disk_and_iowait_details{output_suffix}.txt"
     output_path = os.path.join(archive_dir, output_filename)
-    with open(output_path, "w") as f, contextlib.redirect_stdout(f):
-        if start_str and end_str:
-            print(f"========== Custom Time Range Analysis ==========")
-            print(f"Time Range: From {start_str} to {end_str}")
-            print(f"Format: yy.mm.dd.hhmm\n")
-        analyze_iostat_files(oswiostat_dir, file_list)
+    write_report(output_path, lambda out: analyze_iostat_files(oswiostat_dir, file_list, out=out),
+                 start_str, end_str, cache_inputs=(oswiostat_dir, file_list))
 
     print(f"Disk and IOwait analysis written to: {output_path}")
     return True
@@ -170,16 +553,91 @@ def run_netstat_analysis(file_list=None, output_suffix="", start_str=None, end_s
     
     output_filename = f"netstat_details{output_suffix}.txt"
     output_path = os.path.join(archive_dir, output_filename)
-    with open(output_path, "w") as f, contextlib.redirect_stdout(f):
-        if start_str and end_str:
-            print(f"========== Custom Time Range Analysis ==========")
-            print(f"Time Range: From {start_str} to {end_str}")
-            print(f"Format: yy.mm.dd.hhmm\n")
-        analyze_netstat_files(oswnetstat_dir, file_list)
+    write_report(output_path, lambda out: analyze_netstat_files(oswnetstat_dir, file_list, out=out),
+                 start_str, end_str, cache_inputs=(oswnetstat_dir, file_list))
 
     print(f"Netstat analysis written to: {output_path}")
     return True
 
+def run_analysis_group(analyses):
+    """
+    Worker for run_all_analyses(): runs each analysis in turn and returns the
+    console output of each one, so the parent can print them in menu order.
+    """
+    outputs = []
+    for analysis in analyses:
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            analysis()
+        outputs.append(buf.getvalue())
+    return outputs
+
+
+def run_analyses(analyses):
+    """
+    Runs the given analyses (zero-argument callables, in report order). They read
+    separate directories, so they are spread over forked worker processes and their
+    console messages are printed in the given order; a plain string in analyses is
+    printed as is at its position.
+    The CPU and D-state analyses share a worker so they still share one oswtop scan.
+    Falls back to running them one by one where fork is not available.
+    """
+    groups = {}
+    for analysis in analyses:
+        if isinstance(analysis, str):
+            continue
+        func = getattr(analysis, "func", analysis)
+        groups.setdefault(run_cpu_analysis if func is run_dstate_analysis else func, []).append(analysis)
+
+    if not groups or not PARALLEL_ANALYSES or "fork" not in multiprocessing.get_all_start_methods():
+        for analysis in analyses:
+            if isinstance(analysis, str):
+                print(analysis)
+            else:
+                analysis()
+        return
+
+    # Look up the core count here so it is done once and inherited by the workers;
+    # its message is printed where the first analysis needing it would have printed it
+    needs_cores = (run_cpu_analysis, run_vmstat_analysis)
+    cores_message = ""
+    if any(getattr(analysis, "func", analysis) in needs_cores for analysis in analyses):
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            get_cpu_cores_from_vmstat(oswvmstat_dir)
+        cores_message = buf.getvalue()
+
+    workers = min(len(groups), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+        pending = {}
+        for group in groups.values():
+            future = pool.submit(run_analysis_group, group)
+            for position, analysis in enumerate(group):
+                pending[id(analysis)] = (future, position)
+
+        for analysis in analyses:
+            if isinstance(analysis, str):
+                print(analysis)
+                continue
+            if cores_message and getattr(analysis, "func", analysis) in needs_cores:
+                print(cores_message, end="")
+                cores_message = ""
+            future, position = pending[id(analysis)]
+            print(future.result()[position], end="")
+
+
+def run_all_analyses(only=None):
+    """
+    Runs all six analyses over every file, or just the ones named in only
+    (see ANALYSIS_NAMES); see run_analyses().
+    """
+    analyses = (run_cpu_analysis, run_memory_analysis, run_vmstat_analysis,
+                run_dstate_analysis, run_disk_analysis, run_netstat_analysis)
+    if only:
+        wanted = selected_analyses(only)
+        analyses = [analysis for analysis in analyses if analysis in wanted]
+    run_analyses(analyses)
+
 def get_cpu_cores_from_vmstat(vmstat_dir):
     """
     Attempt to determine CPU core count from vmstat metadata files.
@@ -188,239 +646,304 @@ def get_cpu_cores_from_vmstat(vmstat_dir):
       - CPU_CORES
       - CPU_COUNT (older releases)
     Returns the first successfully parsed integer value.
+    The result is cached per directory until the directory mtime changes.
+    Returns None if the archive has no vmstat directory.
     """
-    possible_keys = ("VCPUS", "CPU_CORES", "CPU_COUNT")
+    try:
+        mtime_ns = os.stat(vmstat_dir).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None  # No vmstat directory; cached like any other failed lookup
+    return read_cpu_cores_from_vmstat(vmstat_dir, mtime_ns)
 
-    for file in sorted(os.listdir(vmstat_dir)):
-        if not file.endswith(".dat"):
-            continue
+@functools.lru_cache(maxsize=4)
+def read_cpu_cores_from_vmstat(vmstat_dir, mtime_ns):
+    """
+    Does the lookup for get_cpu_cores_from_vmstat(); mtime_ns only makes the cache
+    entry go stale when files are added to or removed from the directory, and is
+    None when the directory does not exist.
+    The keys only appear in the metadata header at the top of each file, so a file
+    is read up to its first 'zzz' sample marker.
+    """
+    possible_keys = (b"VCPUS", b"CPU_CORES", b"CPU_COUNT")
+
+    def scan_header(lines):
+        for line in lines:
+            line = line.strip()
+            if line.startswith(b"zzz"):
+                break  # End of the metadata header
+            for key in possible_keys:
+                if line.startswith(key):
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        try:
+                            return key.decode(), int(parts[1])
+                        except ValueError:
+                            continue
+        return None
+
+    for file in (list_dat_files(vmstat_dir) if mtime_ns is not None else []):
         file_path = os.path.join(vmstat_dir, file)
         try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    for key in possible_keys:
-                        if line.startswith(key):
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                try:
-                                    cores = int(parts[1])
-                                    print(f"\nDetected CPU Cores ({key}): {cores}")
-                                    return cores
-                                except ValueError:
-                                    continue
+            with open_dat_file(file_path, "rb") as f:
+                # One read normally covers the whole header; only fall back to
+                # line-by-line reading if no sample marker shows up in it
+                head = f.read(VMSTAT_HEAD_READ_SIZE)
+                if len(head) < VMSTAT_HEAD_READ_SIZE or head.startswith(b"zzz") or b"\nzzz" in head:
+                    found = scan_header(head.split(b"\n"))
+                else:
+                    f.seek(0)
+                    found = scan_header(f)
         except FileNotFoundError:
             continue
 
+        if found:
+            key, cores = found
+            print(f"\nDetected CPU Cores ({key}): {cores}")
+            return cores
+
     print("Could not determine CPU cores from vmstat data.")
     return None
 
 def extract_date_from_filename(filename):
-    match = re.search(r"_(\d{2}\.\d{2}\.\d{2})\.\d{4}\.dat$", filename)
-    return match.group(1) if match else "Unknown Date"
-
-def detect_increasing_load_patterns(load_data, cpu_cores, min_consecutive=6):
-    threshold_50 = 0.5 * cpu_cores
-    increasing_patterns = []
-    temp_pattern = []
-    tracking = False
-
-    for i in range(1, len(load_data)):
-        prev_time, prev_date, prev_load_1m, _, _ = load_data[i - 1]
-        curr_time, curr_date, curr_load_1m, _, _ = load_data[i]
-
-        if curr_load_1m > threshold_50:
-            if not tracking and prev_load_1m > threshold_50:
-                tracking = True
-                temp_pattern = [(prev_time, prev_date, prev_load_1m)]
-
-            if curr_load_1m > prev_load_1m:
-                temp_pattern.append((curr_time, curr_date, curr_load_1m))
+    # Names end in "_yy.mm.dd.hhmm.dat"; slice the date out by fixed offsets
+    tail = filename[-18:]
+    if (len(tail) == 18 and tail[0] == "_" and tail.endswith(".dat")
+            and tail[3] == tail[6] == tail[9] == "."
+            and (tail[1:3] + tail[4:6] + tail[7:9] + tail[10:14]).isdigit()):
+        return tail[1:9]
+    return "Unknown Date"
+
+def find_monotone_runs(values, threshold, increasing, min_consecutive):
+    """
+    Shared run finder behind the load and memory pattern reports.
+    Yields the indices (into values) of each run worth reporting as soon as the run closes:
+      increasing=True  - strictly rising stretches where every value is above threshold
+      increasing=False - falling stretches that start from a value above threshold
+    Only runs with at least min_consecutive entries are yielded.
+    """
+    if increasing:
+        run_start = None
+        # Walk the values pairwise; a run breaks when the series stops rising
+        for i, (prev_val, curr_val) in enumerate(zip(values, values[1:]), 1):
+            if curr_val > threshold:
+                if run_start is None and prev_val > threshold:
+                    run_start = i - 1
+
+                if curr_val <= prev_val:
+                    if run_start is not None and i - run_start >= min_consecutive:
+                        yield range(run_start, i)
+                    run_start = None
             else:
-                if len(temp_pattern) >= min_consecutive:
-                    increasing_patterns.append(temp_pattern)
-                temp_pattern = []
-                tracking = False
-        else:
-            tracking = False
-            temp_pattern = []
+                run_start = None
+
+        if run_start is not None and len(values) - run_start >= min_consecutive:
+            yield range(run_start, len(values))
+    else:
+        run = None
+        for i, (curr_val, next_val) in enumerate(zip(values, values[1:])):
+            if run is None:
+                if curr_val > threshold:
+                    run = [i]
+            elif next_val < curr_val:
+                run.append(i + 1)
+            else:
+                if len(run) >= min_consecutive:
+                    yield run
+                run = None
+
+        if run is not None and len(run) >= min_consecutive:
+            yield run
+
+def detect_increasing_load_patterns(load_data, cpu_cores, min_consecutive=6, out=None):
+    loads = [row[2] for row in load_data]
+    header_printed = False
+
+    # Each run is printed as soon as it is found; the header only appears with the first one
+    for run in find_monotone_runs(loads, 0.5 * cpu_cores, True, min_consecutive):
+        if not header_printed:
+            print("\n=== Detected Increasing Load Average Patterns (5+ consecutive) ===", file=out)
+            header_printed = True
+        samples = (load_data[idx] for idx in run)
+        lines = [f"  [{date_val} {time_val}] Load: {load:.2f}" for time_val, date_val, load, _, _ in samples]
+        # One write per pattern rather than one per sample
+        print("Pattern Detected:", *lines, "-" * 40, sep="\n", file=out)
+
+def detect_decreasing_load_patterns(load_data, cpu_cores, min_consecutive=6, out=None):
+    loads = [row[2] for row in load_data]
+    header_printed = False
+
+    for run in find_monotone_runs(loads, 0.75 * cpu_cores, False, min_consecutive):
+        if not header_printed:
+            print("\n=== Detected Decreasing Load Average Patterns (6+ consecutive) ===", file=out)
+            header_printed = True
+        samples = (load_data[idx] for idx in run)
+        lines = [f"  [{date_val} {time_val}] Load: {load:.2f}" for time_val, date_val, load, _, _ in samples]
+        print("Decreasing Pattern Detected:", *lines, "-" * 40, sep="\n", file=out)
+
+    if not header_printed:
+        print("\nNo significant decreasing load average patterns detected.", file=out)
+
+def parse_oswtop_data(filename, data):
+    """
+    Parses the contents of one oswtop file for scan_oswtop_files().
+    Returns (load_samples, dstate_blocks) for just this file.
+    """
+    load_pattern = OSWTOP_LOAD_RE
+    timestamp_header_pattern = TOP_TIMESTAMP_HEADER_RE
+    process_line_pattern = TOP_PROCESS_LINE_RE
+    load_samples = []
+    dstate_blocks = []
+
+    date = extract_date_from_filename(filename)
+    current_timestamp = None
+    d_processes = []  # Only D-state processes of the current snapshot are kept
+
+    # Iterate lines lazily instead of splitting the whole file into a list first
+    for line in io.BytesIO(data):
+        # Load-average line for the CPU report
+        if line.startswith(b"top - "):
+            match = load_pattern.match(line)
+            if match:
+                timestamp, load_avg_1, load_avg_5, load_avg_15 = match.groups()
+                load_samples.append((filename, timestamp.decode(), date,
+                                     float(load_avg_1), float(load_avg_5), float(load_avg_15)))
+            continue
 
-    if len(temp_pattern) >= min_consecutive:
-        increasing_patterns.append(temp_pattern)
+        line = line.strip()
 
-    if increasing_patterns:
-        print("\n=== Detected Increasing Load Average Patterns (5+ consecutive) ===")
-        for pattern in increasing_patterns:
-            print("Pattern Detected:")
-            for time_val, date_val, load in pattern:
-                print(f"  [{date_val} {time_val}] Load: {load:.2f}")
-            print("-" * 40)
+        # Cheapest checks first: plain byte tests decide whether a regex is worth running
+        if line.startswith(b"zzz"):
+            match_ts = timestamp_header_pattern.match(line)
+            if match_ts:
+                if current_timestamp and d_processes:
+                    dstate_blocks.append((current_timestamp, d_processes))
+                current_timestamp = match_ts.group(1).decode("utf-8", "ignore")
+                d_processes = []
+                continue
 
-def detect_decreasing_load_patterns(load_data, cpu_cores, min_consecutive=6):
-    threshold_75 = 0.75 * cpu_cores
-    decreasing_patterns = []
-    temp_pattern = []
-    tracking = False
-
-    for i in range(len(load_data) - 1):
-        curr_time, curr_date, curr_load_1m, _, _ = load_data[i]
-        next_time, next_date, next_load_1m, _, _ = load_data[i + 1]
-
-        if not tracking:
-            if curr_load_1m > threshold_75:
-                tracking = True
-                temp_pattern = [(curr_time, curr_date, curr_load_1m)]
-        else:
-            if next_load_1m < curr_load_1m:
-                temp_pattern.append((next_time, next_date, next_load_1m))
-            else:
-                if len(temp_pattern) >= min_consecutive:
-                    decreasing_patterns.append(temp_pattern)
-                temp_pattern = []
-                tracking = False
-
-    if len(temp_pattern) >= min_consecutive:
-        decreasing_patterns.append(temp_pattern)
-
-    if decreasing_patterns:
-        print("\n=== Detected Decreasing Load Average Patterns (6+ consecutive) ===")
-        for pattern in decreasing_patterns:
-            print("Decreasing Pattern Detected:")
-            for time_val, date_val, load in pattern:
-                print(f"  [{date_val} {time_val}] Load: {load:.2f}")
-            print("-" * 40)
-    else:
-        print("\nNo significant decreasing load average patterns detected.")
+        # A D-state process row always contains a "D" (the state column)
+        if b"D" not in line:
+            continue
+
+        match_proc = process_line_pattern.match(line)
+        if match_proc and match_proc.group(3) == b"D":
+            pid, user, state, cpu, mem, cmd = match_proc.groups()
+            d_processes.append((pid.decode(), user.decode("utf-8", "ignore"), state.decode(),
+                                float(cpu), float(mem), cmd.decode("utf-8", "ignore")))
+
+    # Final block for last timestamp
+    if current_timestamp and d_processes:
+        dstate_blocks.append((current_timestamp, d_processes))
+
+    return load_samples, dstate_blocks
+
+def scan_oswtop_files(directory, file_list=None):
+    """
+    Reads each oswtop file once and collects what both the CPU report and the
+    D-state report need, so run_cpu_analysis and run_dstate_analysis share one pass.
+    Returns (load_samples, dstate_blocks):
+      load_samples  - (filename, timestamp, date, load_1m, load_5m, load_15m) per "top -" line
+      dstate_blocks - (timestamp, [(pid, user, state, cpu, mem, cmd), ...]) for snapshots
+                      that had D-state processes
+    The last result is cached until the file list or any file's size or mtime changes.
+    """
+    files_to_process = file_list if file_list else list_dat_files(directory)
+    cache_key = (directory, dat_file_stats(directory, files_to_process))
+    if cache_key in OSWTOP_SCAN_CACHE:
+        return OSWTOP_SCAN_CACHE[cache_key]
+
+    dat_files = [filename for filename in files_to_process if filename.endswith(".dat")]
 
-def process_oswtop_files(directory, cpu_cores, threshold_75, file_list=None):
-    pattern = re.compile(r"^top - (\d{2}:\d{2}:\d{2}) .*load average: ([\d.]+), ([\d.]+), ([\d.]+)")
-    highest, lowest = None, None
+    filepaths = [os.path.join(directory, filename) for filename in dat_files]
+    # Files are read ahead by worker threads while the current one is parsed
+    per_file = (parse_oswtop_data(filename, data)
+                for filename, data in zip(dat_files, prefetch_dat_files(filepaths)))
+
+    load_samples = []
+    dstate_blocks = []
+    for file_samples, file_blocks in per_file:
+        load_samples.extend(file_samples)
+        dstate_blocks.extend(file_blocks)
+
+    OSWTOP_SCAN_CACHE.clear()
+    OSWTOP_SCAN_CACHE[cache_key] = (load_samples, dstate_blocks)
+    return load_samples, dstate_blocks
+
+
+def process_oswtop_files(directory, cpu_cores, threshold_75, file_list=None, out=None):
     load_data = []
 
-    print(f"\n======== Analyzing Server instances where CPU crossed 75%+ usage=============\n")
-    print(f"\n The total cpu cores : {cpu_cores}\n")
+    print(f"\n======== Analyzing Server instances where CPU crossed 75%+ usage=============\n", file=out)
+    print(f"\n The total cpu cores : {cpu_cores}\n", file=out)
 
-    # Either analyze all files or filtered ones
-    files_to_process = file_list if file_list else sorted(os.listdir(directory))
+    load_samples, _ = scan_oswtop_files(directory, file_list)
 
-    for filename in files_to_process:
-        if filename.endswith(".dat"):
-            filepath = os.path.join(directory, filename)
-            date = extract_date_from_filename(filename)
+    crossed_lines = []
 
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as file:
-                for line in file:
-                    match = pattern.search(line)
-                    if match:
-                        timestamp, load_avg_1, load_avg_5, load_avg_15 = match.groups()
-                        load_avg_1 = float(load_avg_1)
-                        load_avg_5 = float(load_avg_5)
-                        load_avg_15 = float(load_avg_15)
-                        load_data.append((timestamp, date, load_avg_1, load_avg_5, load_avg_15))
+    for filename, timestamp, date, load_avg_1, load_avg_5, load_avg_15 in load_samples:
+        load_data.append((timestamp, date, load_avg_1, load_avg_5, load_avg_15))
 
-                        if load_avg_1 > threshold_75:
-                            print(f"{filename} - {timestamp} | Load Avg (1m: {load_avg_1}, 5m: {load_avg_5}, 15m: {load_avg_15})")
+        if load_avg_1 > threshold_75:
+            crossed_lines.append(f"{filename} - {timestamp} | Load Avg (1m: {load_avg_1}, 5m: {load_avg_5}, 15m: {load_avg_15})")
 
-                        if highest is None or load_avg_1 > highest[0]:
-                            highest = (load_avg_1, timestamp, date, filename)
-                        if lowest is None or load_avg_1 < lowest[0]:
-                            lowest = (load_avg_1, timestamp, date, filename)
+    # The 75%+ lines are the bulk of the report; emit them with one print
+    if crossed_lines:
+        print("\n".join(crossed_lines), file=out)
 
-    if highest:
+    if load_samples:
+        # max()/min() keep the first sample on ties, same as a running > / < comparison
+        by_load_1m = operator.itemgetter(3)
+        filename, timestamp, date, peak = max(load_samples, key=by_load_1m)[:4]
         print(f"\n======= Peak Load Summary =======\n"
-              f"Filename: {highest[3]}\nDate: {highest[2]}\nTime: {highest[1]}\nPeak Load Avg: {highest[0]}\n")
+              f"Filename: {filename}\nDate: {date}\nTime: {timestamp}\nPeak Load Avg: {peak}\n", file=out)
 
-    if lowest:
+        filename, timestamp, date, low = min(load_samples, key=by_load_1m)[:4]
         print(f"\n======= Lowest Load Summary =======\n"
-              f"Filename: {lowest[3]}\nDate: {lowest[2]}\nTime: {lowest[1]}\nLowest Load Avg: {lowest[0]}\n")
+              f"Filename: {filename}\nDate: {date}\nTime: {timestamp}\nLowest Load Avg: {low}\n", file=out)
 
-    detect_increasing_load_patterns(load_data, cpu_cores, min_consecutive=6)
-    detect_decreasing_load_patterns(load_data, cpu_cores, min_consecutive=6)
+    detect_increasing_load_patterns(load_data, cpu_cores, min_consecutive=6, out=out)
+    detect_decreasing_load_patterns(load_data, cpu_cores, min_consecutive=6, out=out)
 
 
-def detect_increasing_memory_patterns(mem_data, min_consecutive=6):
-    pattern = []
-    tracking = False
-    increasing_patterns = []
+def detect_increasing_memory_patterns(mem_data, min_consecutive=6, out=None):
+    used = [entry[1] for entry in mem_data]
+    header_printed = False
 
-    for i in range(1, len(mem_data)):
-        prev = mem_data[i - 1]
-        curr = mem_data[i]
+    for run in find_monotone_runs(used, 50, True, min_consecutive):
+        if not header_printed:
+            print("\n=== Detected Increasing Memory Usage Patterns (5+ consecutive) ===", file=out)
+            header_printed = True
+        samples = (mem_data[idx] for idx in run)
+        lines = [f"  [{ts}] Used: {used_pct:.2f}% ({used_gb:.2f} GB), Free: {free_gb:.2f} GB"
+                 for ts, used_pct, used_gb, free_gb in samples]
+        print("Pattern Detected:", *lines, "-" * 40, sep="\n", file=out)
 
-        if curr[1] > 50:
-            if not tracking and prev[1] > 50:
-                tracking = True
-                pattern = [prev]
+def detect_decreasing_memory_patterns(mem_data, min_consecutive=6, out=None):
+    used = [entry[1] for entry in mem_data]
+    header_printed = False
 
-            if curr[1] > prev[1]:
-                pattern.append(curr)
-            else:
-                if len(pattern) >= min_consecutive:
-                    increasing_patterns.append(pattern)
-                pattern = []
-                tracking = False
-        else:
-            pattern = []
-            tracking = False
-
-    if len(pattern) >= min_consecutive:
-        increasing_patterns.append(pattern)
-
-    if increasing_patterns:
-        print("\n=== Detected Increasing Memory Usage Patterns (5+ consecutive) ===")
-        for p in increasing_patterns:
-            print("Pattern Detected:")
-            for entry in p:
-                ts, used_pct, used_gb, free_gb = entry
-                print(f"  [{ts}] Used: {used_pct:.2f}% ({used_gb:.2f} GB), Free: {free_gb:.2f} GB")
-            print("-" * 40)
-
-def detect_decreasing_memory_patterns(mem_data, min_consecutive=6):
-    pattern = []
-    tracking = False
-    decreasing_patterns = []
-
-    for i in range(len(mem_data) - 1):
-        curr = mem_data[i]
-        next_ = mem_data[i + 1]
-
-        if not tracking:
-            if curr[1] > 75:
-                tracking = True
-                pattern = [curr]
-        else:
-            if next_[1] < curr[1]:
-                pattern.append(next_)
-            else:
-                if len(pattern) >= min_consecutive:
-                    decreasing_patterns.append(pattern)
-                pattern = []
-                tracking = False
-
-    if len(pattern) >= min_consecutive:
-        decreasing_patterns.append(pattern)
-
-    if decreasing_patterns:
-        print("\n=== Detected Decreasing Memory Usage Patterns (6+ consecutive) ===")
-        for p in decreasing_patterns:
-            print("Pattern Detected:")
-            for entry in p:
-                ts, used_pct, used_gb, free_gb = entry
-                print(f"  [{ts}] Used: {used_pct:.2f}% ({used_gb:.2f} GB), Free: {free_gb:.2f} GB")
-            print("-" * 40)
-    else:
-        print("\nNo significant decreasing memory usage patterns detected.")
+    for run in find_monotone_runs(used, 75, False, min_consecutive):
+        if not header_printed:
+            print("\n=== Detected Decreasing Memory Usage Patterns (6+ consecutive) ===", file=out)
+            header_printed = True
+        samples = (mem_data[idx] for idx in run)
+        lines = [f"  [{ts}] Used: {used_pct:.2f}% ({used_gb:.2f} GB), Free: {free_gb:.2f} GB"
+                 for ts, used_pct, used_gb, free_gb in samples]
+        print("Pattern Detected:", *lines, "-" * 40, sep="\n", file=out)
+
+    if not header_printed:
+        print("\nNo significant decreasing memory usage patterns detected.", file=out)
 
 
 
-def process_oswmeminfo_files(meminfo_dir, file_list=None):
-    highest, lowest = None, None
+def process_oswmeminfo_files(meminfo_dir, file_list=None, out=None):
     total_gb = None
     printed_total = False
     mem_data = []
+    sample_files = []  # File of each mem_data sample, for the peak/lowest summaries
     found_above_75 = False
 
-    print("\n======== Analyzing Memory Usage above 75% =========\n")
+    print("\n======== Analyzing Memory Usage above 75% =========\n", file=out)
 
     # Either analyze all files or only the filtered ones
     #if file_list:
@@ -428,207 +951,167 @@ def process_oswmeminfo_files(meminfo_dir, file_list=None):
     #else:
        # files_to_process = sorted(os.listdir(meminfo_dir))
 
-    files_to_process = file_list if file_list else sorted(os.listdir(meminfo_dir))
+    files_to_process = file_list if file_list else list_dat_files(meminfo_dir)
 
-    for filename in files_to_process:
-        if filename.endswith(".dat"):
-            filepath = os.path.join(meminfo_dir, filename)
+    dat_files = [filename for filename in files_to_process if filename.endswith(".dat")]
+    filepaths = [os.path.join(meminfo_dir, filename) for filename in dat_files]
 
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                timestamp = None
-                values = {}
+    # Files are read ahead by worker threads while the current one is parsed
+    for filename, data in zip(dat_files, prefetch_dat_files(filepaths)):
+        timestamp = None
+        values = [None, None, None, None]  # MemTotal, MemFree, Buffers, Cached
 
-                for line in f:
-                    if line.startswith("zzz "):
-                        if values:
-                            try:
-                                total = int(values["MemTotal"])
-                                free = int(values["MemFree"])
-                                buffers = int(values["Buffers"])
-                                cached = int(values["Cached"])
-
-                                free_mem_kb = free + buffers + cached
-                                used_mem_kb = total - free_mem_kb
-                                used_pct = (used_mem_kb / total) * 100
-                                free_pct = 100 - used_pct
-
-                                total_gb = total / (1024 * 1024)
-                                used_gb = used_mem_kb / (1024 * 1024)
-                                free_gb = free_mem_kb / (1024 * 1024)
-
-                                if not printed_total:
-                                    print(f"Total Memory on Server: {total_gb:.2f} GB\n")
-                                    printed_total = True
-
-                                if used_pct > 75:
-                                    found_above_75 = True
-                                    print(f"{timestamp} | Used: {used_pct:.2f}% "
-                                          f"({used_gb:.2f} GB), Free: {free_pct:.2f}% "
-                                          f"({free_gb:.2f} GB) | File: {filename}")
-
-                                mem_data.append((timestamp, used_pct, used_gb, free_gb))
-
-                                if highest is None or used_pct > highest[0]:
-                                    highest = (used_pct, timestamp, used_gb, free_gb, filename)
-                                if lowest is None or used_pct < lowest[0]:
-                                    lowest = (used_pct, timestamp, used_gb, free_gb, filename)
-
-                            except KeyError:
-                                pass
+        for header, key, value in MEMINFO_LINE_RE.findall(data):
+            if header:
+                if None not in values:
+                    total = int(values[0])
+                    free = int(values[1])
+                    buffers = int(values[2])
+                    cached = int(values[3])
 
-                        values = {}
-                        timestamp = line.strip().replace("zzz ", "").replace("***", "")
+                    free_mem_kb = free + buffers + cached
+                    used_mem_kb = total - free_mem_kb
+                    used_pct = (used_mem_kb / total) * 100
+                    free_pct = 100 - used_pct
 
-                    else:
-                        parts = line.split()
-                        if len(parts) >= 2 and parts[0].endswith(":"):
-                            key = parts[0].rstrip(":")
-                            val = parts[1]
-                            if key in ["MemTotal", "MemFree", "Buffers", "Cached"]:
-                                values[key] = val
+                    total_gb = total / (1024 * 1024)
+                    used_gb = used_mem_kb / (1024 * 1024)
+                    free_gb = free_mem_kb / (1024 * 1024)
 
-    if not found_above_75:
-        print("No occurrences found where memory usage > 75%.")
+                    if not printed_total:
+                        print(f"Total Memory on Server: {total_gb:.2f} GB\n", file=out)
+                        printed_total = True
 
-    if highest:
-        print(f"\n======= Peak Memory Usage Summary =======")
-        print(f"Filename: {highest[4]}")
-        print(f"Timestamp: {highest[1]}")
-        print(f"Used: {highest[0]:.2f}% ({highest[2]:.2f} GB), "
-              f"Free: {100 - highest[0]:.2f}% ({highest[3]:.2f} GB)")
+                    if used_pct > 75:
+                        found_above_75 = True
+                        print(f"{timestamp} | Used: {used_pct:.2f}% "
+                              f"({used_gb:.2f} GB), Free: {free_pct:.2f}% "
+                              f"({free_gb:.2f} GB) | File: {filename}", file=out)
 
-    if lowest:
-        print(f"\n======= Lowest Memory Usage Summary =======")
-        print(f"Filename: {lowest[4]}")
-        print(f"Timestamp: {lowest[1]}")
-        print(f"Used: {lowest[0]:.2f}% ({lowest[2]:.2f} GB), "
-              f"Free: {100 - lowest[0]:.2f}% ({lowest[3]:.2f} GB)")
+                    mem_data.append((timestamp, used_pct, used_gb, free_gb))
+                    sample_files.append(filename)
 
-    detect_increasing_memory_patterns(mem_data, min_consecutive=6)
-    detect_decreasing_memory_patterns(mem_data, min_consecutive=6)
+                values = [None, None, None, None]
+                timestamp = header.strip().replace(b"zzz ", b"").replace(b"***", b"").decode("utf-8", "ignore")
 
+            elif value:
+                values[MEMINFO_SLOTS[key]] = value
 
-def process_oswvmstat_files(vmstat_dir, cpu_cores, file_list=None):
-    print("\n======== Analyzing vmstat output where 'r' > CPU cores ========\n")
+    if not found_above_75:
+        print("No occurrences found where memory usage > 75%.", file=out)
 
-    r_exceeds = []
-    
-    files_to_process = file_list if file_list else sorted(os.listdir(vmstat_dir))
-
-    for filename in files_to_process:
-        if filename.endswith(".dat"):
-            filepath = os.path.join(vmstat_dir, filename)
-            timestamp = None
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    if line.startswith("zzz "):
-                        timestamp = line.strip().replace("zzz ", "").replace("***", "")
-                    elif re.match(r"\s*\d+", line):
-                        columns = re.split(r"\s+", line.strip())
-                        if len(columns) >= 6:
-                            try:
-                                r_val = int(columns[0])
-                                b_val = int(columns[1])
-                                if r_val > cpu_cores:
-                                    r_exceeds.append((timestamp, r_val, b_val))
-                            except ValueError:
-                                continue
+    if mem_data:
+        # max()/min() run in C; index() finds the first sample with that value,
+        # the same one a running > / < comparison would keep
+        used = [sample[1] for sample in mem_data]
+        peak, low = used.index(max(used)), used.index(min(used))
 
-    if r_exceeds:
-        print("Detected times where 'r' (running processes) > CPU cores:\n")
-        for ts, r, b in r_exceeds:
-            print(f"  [{ts}] r = {r}, b = {b}")
-        print(f"\nTotal occurrences: {len(r_exceeds)}")
-    else:
-        print("No 'r' values exceeding CPU cores detected.")
+        timestamp, used_pct, used_gb, free_gb = mem_data[peak]
+        print(f"\n======= Peak Memory Usage Summary =======", file=out)
+        print(f"Filename: {sample_files[peak]}", file=out)
+        print(f"Timestamp: {timestamp}", file=out)
+        print(f"Used: {used_pct:.2f}% ({used_gb:.2f} GB), "
+              f"Free: {100 - used_pct:.2f}% ({free_gb:.2f} GB)", file=out)
 
+        timestamp, used_pct, used_gb, free_gb = mem_data[low]
+        print(f"\n======= Lowest Memory Usage Summary =======", file=out)
+        print(f"Filename: {sample_files[low]}", file=out)
+        print(f"Timestamp: {timestamp}", file=out)
+        print(f"Used: {used_pct:.2f}% ({used_gb:.2f} GB), "
+              f"Free: {100 - used_pct:.2f}% ({free_gb:.2f} GB)", file=out)
 
+    detect_increasing_memory_patterns(mem_data, min_consecutive=6, out=out)
+    detect_decreasing_memory_patterns(mem_data, min_consecutive=6, out=out)
 
 
+def process_oswvmstat_files(vmstat_dir, cpu_cores, file_list=None, out=None):
+    print("\n======== Analyzing vmstat output where 'r' > CPU cores ========\n", file=out)
 
-def analyze_oswtop_data(oswtop_dir, file_list=None):
-    print("analysing the D state processes.") 
-    timestamp_header_pattern = re.compile(r'^zzz \*\*\*(.*?)$')
+    r_exceeds = []
+    
+    files_to_process = file_list if file_list else list_dat_files(vmstat_dir)
+
+    dat_files = [filename for filename in files_to_process if filename.endswith(".dat")]
+    filepaths = [os.path.join(vmstat_dir, filename) for filename in dat_files]
+
+    for filename, data in zip(dat_files, prefetch_dat_files(filepaths)):
+        timestamp = None
+        # Scan the raw bytes; only the timestamps are decoded
+        for line in io.BytesIO(data):
+            if line.startswith(b"zzz "):
+                timestamp = line.strip().replace(b"zzz ", b"").replace(b"***", b"").decode("utf-8", "ignore")
+            # Data rows start with the numeric 'r' column; one byte test rejects headers and blanks
+            elif line.lstrip()[:1].isdigit():
+                # Only r and b are read; stop splitting once the row is known to have 6+ columns
+                columns = line.split(None, 6)
+                if len(columns) >= 6:
+                    try:
+                        r_val = int(columns[0])
+                        b_val = int(columns[1])
+                        if r_val > cpu_cores:
+                            r_exceeds.append((timestamp, r_val, b_val))
+                    except ValueError:
+                        continue
 
-    # Pattern to match process lines
-    process_line_pattern = re.compile(
-        r'^\s*(\d+)\s+(\S+)\s+\d+\s+\S+\s+\S+\s+\S+\s+\S+\s+([RSDZTW])\s+([\d.]+)\s+([\d.]+)\s+[\d:.]+\s+(.+)$'
-    )
+    if r_exceeds:
+        print("Detected times where 'r' (running processes) > CPU cores:\n", file=out)
+        print("\n".join(f"  [{ts}] r = {r}, b = {b}" for ts, r, b in r_exceeds), file=out)
+        print(f"\nTotal occurrences: {len(r_exceeds)}", file=out)
+    else:
+        print("No 'r' values exceeding CPU cores detected.", file=out)
 
-    files_to_process = file_list if file_list else sorted(os.listdir(oswtop_dir))
-    
-    for file in files_to_process:
-        filepath = os.path.join(oswtop_dir, file)
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
 
-        current_timestamp = None
-        process_list = []
 
-        for line in lines:
-            line = line.strip()
 
-            match_ts = timestamp_header_pattern.match(line)
-            if match_ts:
-                if current_timestamp and process_list:
-                    d_processes = [proc for proc in process_list if proc['state'] == 'D']
-                    if d_processes:
-                        print(f"\n[{current_timestamp}] D-state Processes (Count: {len(d_processes)}):")
-                        for proc in d_processes:
-                            print(f"PID={proc['pid']}, USER={proc['user']}, STATE={proc['state']}, CPU={proc['cpu']}%, MEM={proc['mem']}%, CMD={proc['cmd']}")
-                current_timestamp = match_ts.group(1)
-                process_list = []
-                continue
 
-            match_proc = process_line_pattern.match(line)
-            if match_proc:
-                proc_info = {
-                    'pid': match_proc.group(1),
-                    'user': match_proc.group(2),
-                    'state': match_proc.group(3),
-                    'cpu': float(match_proc.group(4)),
-                    'mem': float(match_proc.group(5)),
-                    'cmd': match_proc.group(6)
-                }
-                process_list.append(proc_info)
+def analyze_oswtop_data(oswtop_dir, file_list=None, out=None):
+    print("analysing the D state processes.", file=out) 
+    _, dstate_blocks = scan_oswtop_files(oswtop_dir, file_list)
 
-        # Final block for last timestamp
-        if current_timestamp and process_list:
-            d_processes = [proc for proc in process_list if proc['state'] == 'D']
-            if d_processes:
-                print(f"\n[{current_timestamp}] D-state Processes (Count: {len(d_processes)}):")
-                for proc in d_processes:
-                    print(f"PID={proc['pid']}, USER={proc['user']}, STATE={proc['state']}, CPU={proc['cpu']}%, MEM={proc['mem']}%, CMD={proc['cmd']}")
+    for current_timestamp, d_processes in dstate_blocks:
+        lines = [f"PID={pid}, USER={user}, STATE={state}, CPU={cpu}%, MEM={mem}%, CMD={cmd}"
+                 for pid, user, state, cpu, mem, cmd in d_processes]
+        print(f"\n[{current_timestamp}] D-state Processes (Count: {len(d_processes)}):", *lines, sep="\n", file=out)
 
 
 
 
 
 
-def analyze_iostat_files(directory, file_list=None):
+def analyze_iostat_files(directory, file_list=None, out=None):
     iowait_records = []  # To store tuples (timestamp, iowait)
     high_util_disks = []  # To store tuples (timestamp, disk, read_MBps, write_MBps, util%)
     
     def kb_to_mb(kb):
         return kb / 1024.0
     
-    files_to_process = file_list if file_list else sorted(os.listdir(directory))
+    files_to_process = file_list if file_list else list_dat_files(directory)
     
-    for filename in files_to_process:
-        if not filename.endswith(".dat"):
-            continue
-        filepath = os.path.join(directory, filename)
-        with open(filepath, 'r') as f:
-            timestamp = None
-            header = None
-            for line in f:
-                line = line.strip()
+    dat_files = [filename for filename in files_to_process if filename.endswith(".dat")]
+    filepaths = [os.path.join(directory, filename) for filename in dat_files]
+
+    # Read ahead in worker threads and parse the raw bytes; only the timestamps and the
+    # names of busy devices are decoded
+    for filename, data in zip(dat_files, prefetch_dat_files(filepaths)):
+        if b"\r" in data:
+            # Same line breaks as reading the file in text mode
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        f = io.BytesIO(data)
+        timestamp = None
+        header = None
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            # Device rows are most of the file; only a line starting like one of the
+            # section markers needs the prefix checks
+            if line[0] in IOSTAT_MARKER_INITIALS:
                 # Extract timestamp
-                if line.startswith('zzz') or line.startswith('***'):
-                    timestamp = line.split('***')[-1].strip()
+                if line.startswith(b'zzz') or line.startswith(b'***'):
+                    timestamp = line.split(b'***')[-1].strip().decode("utf-8", "ignore")
                     continue
                 # Handle avg-cpu section
-                if line.startswith('avg-cpu:'):
+                if line.startswith(b'avg-cpu:'):
                     try:
                         cpu_line = next(f).strip()
                         parts = cpu_line.split()
@@ -639,48 +1122,49 @@ def analyze_iostat_files(directory, file_list=None):
                         continue
                     continue
                 # Look for header line to determine column indices
-                if line.startswith('Device'):
+                if line.startswith(b'Device'):
                     header = line.split()
+                    header_len = len(header)
+                    # Resolve the wanted columns once per header, not once per device line
+                    try:
+                        read_kBps_idx = header.index(b'rkB/s')
+                        write_kBps_idx = header.index(b'wkB/s')
+                        util_idx = header.index(b'%util')
+                    except ValueError:
+                        header = None  # Columns we need are missing; skip this section
                     continue
-                if line == '':
+            # Process device statistics lines
+            if header:
+                parts = line.split()
+                if len(parts) < header_len:
                     continue
-                # Process device statistics lines
-                if header and not line.startswith('avg-cpu:') and not line.startswith('zzz') and not line.startswith('***'):
-                    parts = line.split()
-                    if len(parts) < len(header):
-                        continue
-                    try:
-                        device = parts[0]
-                        # Dynamically find indices for rkB/s, wkB/s, and %util based on header
-                        read_kBps_idx = header.index('rkB/s') if 'rkB/s' in header else -1
-                        write_kBps_idx = header.index('wkB/s') if 'wkB/s' in header else -1
-                        util_idx = header.index('%util') if '%util' in header else -1
-                        
-                        if read_kBps_idx == -1 or write_kBps_idx == -1 or util_idx == -1:
-                            continue
-                            
-                        read_kBps = float(parts[read_kBps_idx])
-                        write_kBps = float(parts[write_kBps_idx])
-                        util = float(parts[util_idx])
-                    except (ValueError, IndexError):
+                try:
+                    device = parts[0]
+                    util = float(parts[util_idx])
+                    # Most device lines are below the threshold; only convert
+                    # the throughput columns for the busy ones
+                    if not util > 50.0:
                         continue
-                    if util > 50.0:
-                        read_MBps = kb_to_mb(read_kBps)
-                        write_MBps = kb_to_mb(write_kBps)
-                        high_util_disks.append((timestamp, device, read_MBps, write_MBps, util))
+                    read_kBps = float(parts[read_kBps_idx])
+                    write_kBps = float(parts[write_kBps_idx])
+                except (ValueError, IndexError):
+                    continue
+                read_MBps = kb_to_mb(read_kBps)
+                write_MBps = kb_to_mb(write_kBps)
+                high_util_disks.append((timestamp, device.decode("utf-8", "ignore"), read_MBps, write_MBps, util))
     
     # Print top 20 iowait values
-    print("Top 30 highest iowait values:")
-    for ts, io in sorted(iowait_records, key=lambda x: x[1], reverse=True)[:30]:
-        print(f"{ts} - iowait: {io:.2f}%")
+    top_iowait = [f"{ts} - iowait: {iowait:.2f}%"
+                  for ts, iowait in heapq.nlargest(30, iowait_records, key=operator.itemgetter(1))]
+    print("Top 30 highest iowait values:", *top_iowait, sep="\n", file=out)
     
-    # Print high-utilization disks
-    print("\nDisks with utilization > 50%:")
-    for ts, dev, r_mb, w_mb, util in high_util_disks:
-        print(f"{ts} - Device: {dev}, Read: {r_mb:.2f} MB/s, Write: {w_mb:.2f} MB/s, Utilization: {util:.2f}%")
+    # Print high-utilization disks; one print for the whole list, which can be long
+    busy_lines = [f"{ts} - Device: {dev}, Read: {r_mb:.2f} MB/s, Write: {w_mb:.2f} MB/s, Utilization: {util:.2f}%"
+                  for ts, dev, r_mb, w_mb, util in high_util_disks]
+    print("\nDisks with utilization > 50%:", *busy_lines, sep="\n", file=out)
 
 
-def analyze_netstat_files(directory, file_list=None):
+def analyze_netstat_files(directory, file_list=None, out=None):
     """
     Analyze OSWatcher netstat output for network drops and trends.
 
@@ -695,9 +1179,9 @@ def analyze_netstat_files(directory, file_list=None):
       and give a concise per-interface summary.
     """
 
-    print("\n======== Analyzing Network Drops from OSWatcher netstat ========\n")
+    print("\n======== Analyzing Network Drops from OSWatcher netstat ========\n", file=out)
 
-    files_to_process = file_list if file_list else sorted(os.listdir(directory))
+    files_to_process = file_list if file_list else list_dat_files(directory)
 
     # Per-interval events: (timestamp, iface, direction, drop_pct, drops, packets)
     interval_events = []
@@ -707,207 +1191,314 @@ def analyze_netstat_files(directory, file_list=None):
     # Previous snapshot cumulative counters per interface
     prev = {}  # iface -> {rx_pkts, rx_drops, tx_pkts, tx_drops}
 
-    def update_iface_stats(iface, direction, drop_pct, drops, packets):
-        stats = iface_stats.setdefault(iface, {
-            "total_rx_drops": 0,
-            "total_tx_drops": 0,
-            "total_rx_packets": 0,
-            "total_tx_packets": 0,
-            "worst_rx_pct": 0.0,
-            "worst_rx_ts": None,
-            "worst_tx_pct": 0.0,
-            "worst_tx_ts": None,
-        })
-
-        if direction == "RX":
-            stats["total_rx_drops"] += drops
-            stats["total_rx_packets"] += packets
-            if drop_pct > stats["worst_rx_pct"]:
-                stats["worst_rx_pct"] = drop_pct
-                stats["worst_rx_ts"] = current_ts
-        else:
-            stats["total_tx_drops"] += drops
-            stats["total_tx_packets"] += packets
-            if drop_pct > stats["worst_tx_pct"]:
-                stats["worst_tx_pct"] = drop_pct
-                stats["worst_tx_ts"] = current_ts
-
-    for filename in files_to_process:
-        if not filename.endswith(".dat"):
-            continue
+    # Interface names seen so far, keyed by the raw matched text, so each name is
+    # decoded once and every snapshot, event and stats key shares the same str
+    iface_names = {}
 
+    def commit_snapshot():
+        # Turns the completed snapshot (at current_ts) into drop events against the previous one
+        for iface, vals in snapshot.items():
+            if iface == "lo":
+                # Skip loopback for drop analysis
+                continue
+            old = prev.get(iface)
+            if old:
+                for direction, pkts_key, drops_key in NETSTAT_DIRECTIONS.values():
+                    # Compute deltas
+                    d_pkts = vals[pkts_key] - old[pkts_key]
+                    d_drops = vals[drops_key] - old[drops_key]
+
+                    # Ignore counter resets or negative jumps; the drops are tested first
+                    # since most intervals drop nothing
+                    if d_drops > 0 and d_pkts >= 0:
+                        drop_pct = (d_drops / (d_pkts + d_drops)) * 100.0
+                        interval_events.append((current_ts, iface, direction, drop_pct, d_drops, d_pkts))
+
+                        # Per-interface totals and worst interval
+                        stats = iface_stats.get(iface)
+                        if stats is None:
+                            stats = iface_stats[iface] = {
+                                "total_rx_drops": 0,
+                                "total_tx_drops": 0,
+                                "total_rx_packets": 0,
+                                "total_tx_packets": 0,
+                                "worst_rx_pct": 0.0,
+                                "worst_rx_ts": None,
+                                "worst_tx_pct": 0.0,
+                                "worst_tx_ts": None,
+                            }
+                        packets_key, drops_total_key, worst_pct_key, worst_ts_key = NETSTAT_STATS_KEYS[direction]
+                        stats[drops_total_key] += d_drops
+                        stats[packets_key] += d_pkts
+                        if drop_pct > stats[worst_pct_key]:
+                            stats[worst_pct_key] = drop_pct
+                            stats[worst_ts_key] = current_ts
+
+            # Store latest snapshot as previous
+            prev[iface] = vals
+
+    dat_files = [filename for filename in files_to_process if filename.endswith(".dat")]
+
+    for position, filename in enumerate(dat_files):
         filepath = os.path.join(directory, filename)
-        with open(filepath, "r") as f:
-            lines = f.readlines()
+        if position + 1 < len(dat_files):
+            # Get the next file's read started while this one is parsed
+            advise_will_need(os.path.join(directory, dat_files[position + 1]))
 
         current_ts = None
         # Temporary snapshot for this timestamp: iface -> cumulative counters
         snapshot = {}
         current_iface = None
 
-        i = 0
-        while i < len(lines):
-            line = lines[i].rstrip("\n")
-
-            # New timestamp block
-            if line.startswith("zzz") or line.startswith("***"):
-                # Process previous completed snapshot before starting new one
-                if current_ts and snapshot:
-                    for iface, vals in snapshot.items():
-                        if iface == "lo":
-                            # Skip loopback for drop analysis
-                            continue
-                        old = prev.get(iface)
-                        if old:
-                            # Compute deltas
-                            d_rx_pkts = vals["rx_pkts"] - old["rx_pkts"]
-                            d_rx_drops = vals["rx_drops"] - old["rx_drops"]
-                            d_tx_pkts = vals["tx_pkts"] - old["tx_pkts"]
-                            d_tx_drops = vals["tx_drops"] - old["tx_drops"]
-
-                            # Ignore counter resets or negative jumps
-                            if d_rx_pkts >= 0 and d_rx_drops >= 0:
-                                total_rx = d_rx_pkts + d_rx_drops
-                                if total_rx > 0 and d_rx_drops > 0:
-                                    rx_pct = (d_rx_drops / total_rx) * 100.0
-                                    interval_events.append((current_ts, iface, "RX", rx_pct, d_rx_drops, d_rx_pkts))
-                                    update_iface_stats(iface, "RX", rx_pct, d_rx_drops, d_rx_pkts)
-
-                            if d_tx_pkts >= 0 and d_tx_drops >= 0:
-                                total_tx = d_tx_pkts + d_tx_drops
-                                if total_tx > 0 and d_tx_drops > 0:
-                                    tx_pct = (d_tx_drops / total_tx) * 100.0
-                                    interval_events.append((current_ts, iface, "TX", tx_pct, d_tx_drops, d_tx_pkts))
-                                    update_iface_stats(iface, "TX", tx_pct, d_tx_drops, d_tx_pkts)
-
-                        # Store latest snapshot as previous
-                        prev[iface] = vals
-
-                # Start new snapshot
-                # Example: "zzz ***Sat Nov 22 04:00:07 CST 2025"
-                if "***" in line:
-                    current_ts = line.split("***", 1)[1].strip()
-                else:
-                    current_ts = line.split("zzz", 1)[1].strip()
-                snapshot = {}
-                current_iface = None
-                i += 1
-                continue
-
-            # Ignore until we have a timestamp
-            if not current_ts:
-                i += 1
-                continue
-
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#kernel"):
-                i += 1
-                continue
-
-            # Interface line: "2: enp1s0: ..."
-            m = re.match(r"^\d+:\s+([^:]+):", stripped)
-            if m:
-                current_iface = m.group(1).split()[0]
-                # Initialize snapshot record if needed
-                if current_iface not in snapshot:
-                    snapshot[current_iface] = {"rx_pkts": 0, "rx_drops": 0, "tx_pkts": 0, "tx_drops": 0}
-                i += 1
-                continue
-
-            # RX line header
-            if stripped.startswith("RX:") and current_iface:
-                # Next line holds the numbers
-                if i + 1 < len(lines):
-                    data = lines[i + 1].strip().split()
-                    if len(data) >= 4:
-                        # bytes packets errors dropped ...
-                        try:
-                            rx_packets = int(data[1])
-                            rx_drops = int(data[3])
-                            snapshot[current_iface]["rx_pkts"] = rx_packets
-                            snapshot[current_iface]["rx_drops"] = rx_drops
-                        except ValueError:
-                            pass
-                    i += 2
-                    continue
-
-            # TX line header
-            if stripped.startswith("TX:") and current_iface:
-                if i + 1 < len(lines):
-                    data = lines[i + 1].strip().split()
-                    if len(data) >= 4:
-                        try:
-                            tx_packets = int(data[1])
-                            tx_drops = int(data[3])
-                            snapshot[current_iface]["tx_pkts"] = tx_packets
-                            snapshot[current_iface]["tx_drops"] = tx_drops
-                        except ValueError:
-                            pass
-                    i += 2
-                    continue
+        # Only timestamp, interface and RX:/TX: header lines matter; the regex finds them
+        # in the mapped file without a Python step for every other line
+        with mapped_file(filepath) as buf:
+            # Bound methods as locals for the per-match loop
+            search = NETSTAT_LINE_RE.search
+            find = buf.find
+            size = len(buf)
+            match = search(buf)
+            while match:
+                pos = match.end()
+                kind = match.lastgroup
+
+                # New timestamp block
+                if kind == "ts":
+                    # Process previous completed snapshot before starting new one
+                    if current_ts and snapshot:
+                        commit_snapshot()
+
+                    # Start new snapshot
+                    # Example: "zzz ***Sat Nov 22 04:00:07 CST 2025"
+                    line = match.group("ts")
+                    if b"***" in line:
+                        current_ts = line.split(b"***", 1)[1].strip()
+                    else:
+                        current_ts = line.split(b"zzz", 1)[1].strip()
+                    current_ts = current_ts.decode("utf-8", "ignore")
+                    snapshot = {}
+                    current_iface = None
+
+                # Ignore until we have a timestamp
+                elif not current_ts:
+                    pass
+
+                # Interface line: "2: enp1s0: ..."
+                elif kind == "iface":
+                    raw_iface = match.group("iface")
+                    current_iface = iface_names.get(raw_iface)
+                    if current_iface is None:
+                        current_iface = iface_names[raw_iface] = raw_iface.split()[0].decode("utf-8", "ignore")
+                    # Initialize snapshot record if needed
+                    if current_iface not in snapshot:
+                        snapshot[current_iface] = {"rx_pkts": 0, "rx_drops": 0, "tx_pkts": 0, "tx_drops": 0}
+
+                # RX:/TX: header; the next line holds the numbers and is consumed with it
+                elif current_iface:
+                    nl = find(b"\n", pos)
+                    if nl >= 0 and nl + 1 < size:
+                        pos = find(b"\n", nl + 1)
+                        if pos < 0:
+                            pos = size
+                        # Only packets (1) and dropped (3) are needed; leave the rest unsplit
+                        data = buf[nl + 1:pos].split(None, 4)
+                        if len(data) >= 4:
+                            # bytes packets errors dropped ...
+                            try:
+                                packets = int(data[1])
+                                drops = int(data[3])
+                                _, pkts_key, drops_key = NETSTAT_DIRECTIONS[match.group("direction")]
+                                snapshot[current_iface][pkts_key] = packets
+                                snapshot[current_iface][drops_key] = drops
+                            except ValueError:
+                                pass
 
-            i += 1
+                match = search(buf, pos)
 
         # End-of-file: process last snapshot for this file
         if current_ts and snapshot:
-            for iface, vals in snapshot.items():
-                if iface == "lo":
-                    continue
-                old = prev.get(iface)
-                if old:
-                    d_rx_pkts = vals["rx_pkts"] - old["rx_pkts"]
-                    d_rx_drops = vals["rx_drops"] - old["rx_drops"]
-                    d_tx_pkts = vals["tx_pkts"] - old["tx_pkts"]
-                    d_tx_drops = vals["tx_drops"] - old["tx_drops"]
-
-                    if d_rx_pkts >= 0 and d_rx_drops >= 0:
-                        total_rx = d_rx_pkts + d_rx_drops
-                        if total_rx > 0 and d_rx_drops > 0:
-                            rx_pct = (d_rx_drops / total_rx) * 100.0
-                            interval_events.append((current_ts, iface, "RX", rx_pct, d_rx_drops, d_rx_pkts))
-                            update_iface_stats(iface, "RX", rx_pct, d_rx_drops, d_rx_pkts)
-
-                    if d_tx_pkts >= 0 and d_tx_drops >= 0:
-                        total_tx = d_tx_pkts + d_tx_drops
-                        if total_tx > 0 and d_tx_drops > 0:
-                            tx_pct = (d_tx_drops / total_tx) * 100.0
-                            interval_events.append((current_ts, iface, "TX", tx_pct, d_tx_drops, d_tx_pkts))
-                            update_iface_stats(iface, "TX", tx_pct, d_tx_drops, d_tx_pkts)
-
-                prev[iface] = vals
+            commit_snapshot()
 
     # ---------- Reporting ----------
 
     if not interval_events:
-        print("No packet drops detected between snapshots (all deltas are zero).")
+        print("No packet drops detected between snapshots (all deltas are zero).", file=out)
         return
 
     # 1) Top intervals by drop percentage (RX + TX together) without discarding low-traffic intervals
-    print("Top 20 intervals by packet drop percentage (RX/TX combined):")
-    for ts, iface, direction, pct, drops, pkts in sorted(interval_events, key=lambda x: x[3], reverse=True)[:20]:
-        print(f"{ts} - {iface} [{direction}] Drop%: {pct:.4f}%  ({drops} packet drops out of {pkts} packets)")
+    top_intervals = [f"{ts} - {iface} [{direction}] Drop%: {pct:.4f}%  ({drops} packet drops out of {pkts} packets)"
+                     for ts, iface, direction, pct, drops, pkts
+                     in heapq.nlargest(20, interval_events, key=operator.itemgetter(3))]
+    print("Top 20 intervals by packet drop percentage (RX/TX combined):", *top_intervals, sep="\n", file=out)
 
-    # 2) Per-interface summary
-    print("\nPer-interface drop summary:")
+    # 2) Per-interface summary, collected and printed in one go
+    summary = ["\nPer-interface drop summary:"]
     for iface, stats in sorted(iface_stats.items()):
         total_rx = stats["total_rx_packets"] + stats["total_rx_drops"]
         total_tx = stats["total_tx_packets"] + stats["total_tx_drops"]
         agg_rx_pct = (stats["total_rx_drops"] / total_rx * 100.0) if total_rx > 0 else 0.0
         agg_tx_pct = (stats["total_tx_drops"] / total_tx * 100.0) if total_tx > 0 else 0.0
 
-        print(f"\nInterface: {iface}")
-        print(f"  Aggregate RX drops: {stats['total_rx_drops']} over {stats['total_rx_packets']} packets "
-              f"({agg_rx_pct:.5f}% overall)")
+        summary.append(f"\nInterface: {iface}")
+        summary.append(f"  Aggregate RX drops: {stats['total_rx_drops']} over {stats['total_rx_packets']} packets "
+                       f"({agg_rx_pct:.5f}% overall)")
         if stats["worst_rx_ts"]:
-            print(f"  Worst RX interval: {stats['worst_rx_ts']}  ({stats['worst_rx_pct']:.5f}% drop)")
+            summary.append(f"  Worst RX interval: {stats['worst_rx_ts']}  ({stats['worst_rx_pct']:.5f}% drop)")
 
-        print(f"  Aggregate TX drops: {stats['total_tx_drops']} over {stats['total_tx_packets']} packets "
-              f"({agg_tx_pct:.5f}% overall)")
+        summary.append(f"  Aggregate TX drops: {stats['total_tx_drops']} over {stats['total_tx_packets']} packets "
+                       f"({agg_tx_pct:.5f}% overall)")
         if stats["worst_tx_ts"]:
-            print(f"  Worst TX interval: {stats['worst_tx_ts']}  ({stats['worst_tx_pct']:.5f}% drop)")
+            summary.append(f"  Worst TX interval: {stats['worst_tx_ts']}  ({stats['worst_tx_pct']:.5f}% drop)")
+    print(*summary, sep="\n", file=out)
+
+def selected_analyses(only):
+    """Maps the --only names to their run_* functions."""
+    return {ANALYSIS_NAMES[name] for name in only}
+
+
+def run_all_menu_choice(only=None):
+    print("\n  Running All Analyses...\n")
+    run_all_analyses(only)
+    print("\n All analyses completed successfully!")
+
+
+def run_timerange_analyses(start_str, end_str, only=None):
+    """
+    Runs every analysis (or just the ones named in only) over the files whose names
+    fall between start_str and end_str (yy.mm.dd.hhmm), writing the *_timerange.txt reports.
+    """
+    # (analysis, input directory, message when it has no files in the range), in report order
+    timerange_analyses = (
+        (run_cpu_analysis, oswtop_dir, "No CPU files found in the given range."),
+        (run_memory_analysis, oswmeminfo_dir, "No Memory files found in the given range."),
+        (run_vmstat_analysis, oswvmstat_dir, "No VMStat files found in the given range."),
+        (run_dstate_analysis, oswtop_dir, "No OSWtop files found in the given range for D-state analysis."),
+        (run_disk_analysis, oswiostat_dir, "No Disk (iostat) files found in the given range."),
+        (run_netstat_analysis, oswnetstat_dir, "No Netstat files found in the given range."),
+    )
+    if only:
+        wanted = selected_analyses(only)
+        timerange_analyses = [row for row in timerange_analyses if row[0] in wanted]
+
+    # Filter each directory once; CPU and D-state share the oswtop selection.
+    # A directory missing from the archive has no files in range, so it is not listed at all
+    selected_files = {}
+    for _, directory, _ in timerange_analyses:
+        if directory not in selected_files:
+            selected_files[directory] = (filter_files_by_timerange(directory, start_str, end_str)
+                                         if os.path.isdir(directory) else [])
+
+    output_suffix = "_timerange"
+
+    print("\nRunning all analyses for custom time range...\n")
+    analyses_run = any(selected_files.values())
+    # Analyses to run, with a message in place of each one that has no files in range
+    analyses = []
+    for analysis, directory, missing_message in timerange_analyses:
+        files = selected_files[directory]
+        if files:
+            analyses.append(functools.partial(analysis, files, output_suffix, start_str, end_str))
+        else:
+            analyses.append(missing_message)
+
+    run_analyses(analyses)
+
+    if analyses_run:
+        print("\nAll time-range analyses completed successfully!")
+    else:
+        print("\nNo files found in the given time range for any analysis type.")
+
+
+def run_timerange_menu_choice():
+    print("\n========== Custom Time Range Analysis ==========")
+    print("Select analysis type for time range:")
+
+    print("\n Enter time range in format yy.mm.dd.hhmm (e.g., 25.09.08.0100)")
+    start_str = input("From: ").strip()
+    end_str   = input("To: ").strip()
+    # Reject a mistyped time here rather than failing inside the analyses
+    if not (timestamp_key(start_str) and timestamp_key(end_str)):
+        print("Invalid time format. Use yy.mm.dd.hhmm (e.g., 25.09.08.0100).")
+        return
+    run_timerange_analyses(start_str, end_str)
+
+
+# Analysis names accepted by --only, in report order
+ANALYSIS_NAMES = {
+    "cpu": run_cpu_analysis,
+    "memory": run_memory_analysis,
+    "vmstat": run_vmstat_analysis,
+    "dstate": run_dstate_analysis,
+    "disk": run_disk_analysis,
+    "netstat": run_netstat_analysis,
+}
+
+# Interactive menu choices; "3" (exit) is handled by the loop itself
+MENU_ACTIONS = {
+    "1": run_all_menu_choice,
+    "2": run_timerange_menu_choice,
+}
+
+
+def serve_commands(lines):
+    """
+    Batch driver for 'serve': runs one command per line ("all", "range FROM TO",
+    "exit") in this process, so the listing and time-index caches stay warm
+    across many queries against the same archive.
+    """
+    for line in lines:
+        command = line.split()
+        if not command:
+            continue
+        if command[0] == "all":
+            run_all_menu_choice()
+        elif command[0] == "range" and len(command) == 3:
+            if timestamp_key(command[1]) and timestamp_key(command[2]):
+                run_timerange_analyses(command[1], command[2])
+            else:
+                print(f"Expected yy.mm.dd.hhmm times: {line.strip()}")
+        elif command[0] == "exit":
+            break
+        else:
+            print(f"Unknown command: {line.strip()}")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Analyze an OSWatcher archive. Without a command, the interactive menu is shown.",
+        epilog="commands: all - run all analyses; range - run all analyses over --from/--to; "
+               "serve - read 'all' / 'range FROM TO' commands from stdin, one per line")
+    parser.add_argument("archive", nargs="?",
+                        help="path to the OSWatcher archive directory (prompted for if omitted)")
+    parser.add_argument("command", nargs="?", choices=("all", "range", "serve"),
+                        help="run without the menu (see below)")
+    parser.add_argument("--from", dest="start", help="range: start time, yy.mm.dd.hhmm")
+    parser.add_argument("--to", dest="end", help="range: end time, yy.mm.dd.hhmm")
+    parser.add_argument("--only", action="append", choices=ANALYSIS_NAMES,
+                        help="all/range: run just this analysis; can be given more than once")
+
+    args = parser.parse_args()
+    if args.command is None and args.archive in ("all", "range", "serve") and not os.path.isdir(args.archive):
+        # Command given without an archive path; the path is prompted for
+        args.archive, args.command = None, args.archive
+    if args.archive is not None and not os.path.isdir(args.archive):
+        parser.error(f"not a directory: {args.archive}")
+    if args.command == "range":
+        if args.start is None or args.end is None:
+            parser.error("range needs --from and --to")
+        for value in (args.start, args.end):
+            if not timestamp_key(value):
+                parser.error(f"expected yy.mm.dd.hhmm, got: {value}")
+    elif args.start is not None or args.end is not None:
+        parser.error("--from and --to only apply to the range command")
+    if args.only and args.command not in ("all", "range"):
+        parser.error("--only only applies to the all and range commands")
+    return args
+
 
 if __name__ == "__main__":
-    archive_dir = get_oswarchive_path()
+    args = parse_arguments()
+    archive_dir = args.archive if args.archive else get_oswarchive_path()
 
     oswtop_dir = os.path.join(archive_dir, "oswtop")
     oswvmstat_dir = os.path.join(archive_dir, "oswvmstat")
@@ -919,10 +1510,17 @@ if __name__ == "__main__":
    #unzip_gz_files(oswmeminfo_dir)
    # unzip_gz_files(oswiostat_dir)
     required_dirs = ["oswtop", "oswvmstat", "oswmeminfo", "oswiostat", "oswnetstat"]
-    prepare_all_archives(archive_dir, required_dirs)
+    if EXTRACT_ARCHIVES:
+        prepare_all_archives(archive_dir, required_dirs)
 
-    
-    while True:
+    if args.command == "all":
+        run_all_menu_choice(args.only)
+    elif args.command == "range":
+        run_timerange_analyses(args.start, args.end, args.only)
+    elif args.command == "serve":
+        serve_commands(sys.stdin)
+
+    while args.command is None:
         
         print("\n========== OSWatcher Analysis Menu ==========")
         print("1. Run All Analyses")
@@ -931,80 +1529,8 @@ if __name__ == "__main__":
 
         choice = input("Enter your choice (1-3): ").strip()
 
-        if choice == "1":
-            print("\n  Running All Analyses...\n")
-            run_cpu_analysis()
-            run_memory_analysis()
-            run_vmstat_analysis()
-            run_dstate_analysis()
-            run_disk_analysis()
-            run_netstat_analysis()
-            print("\n All analyses completed successfully!")            
-        
-        elif choice == "2":
-            print("\n========== Custom Time Range Analysis ==========")
-            print("Select analysis type for time range:")
-        
-            print("\n Enter time range in format yy.mm.dd.hhmm (e.g., 25.09.08.0100)")
-            start_str = input("From: ").strip()
-            end_str   = input("To: ").strip()
-
-            # Filter files based on type
-            selected_files_cpu = filter_files_by_timerange(oswtop_dir, start_str, end_str)
-            selected_files_memory = filter_files_by_timerange(oswmeminfo_dir, start_str, end_str)
-            selected_files_vmstat = filter_files_by_timerange(oswvmstat_dir, start_str, end_str)
-            selected_files_disk = filter_files_by_timerange(oswiostat_dir, start_str, end_str)
-            selected_files_netstat = filter_files_by_timerange(oswnetstat_dir, start_str, end_str)
-            
-            output_suffix = "_timerange"
-            
-            # Execute based on user choice
-            
-            print("\nRunning all analyses for custom time range...\n")
-            analyses_run = False
-                    
-            if selected_files_cpu:
-                 run_cpu_analysis(selected_files_cpu, output_suffix, start_str, end_str)
-                 analyses_run = True
-            else:
-                print("No CPU files found in the given range.")
-                        
-            if selected_files_memory:
-                 run_memory_analysis(selected_files_memory, output_suffix, start_str, end_str)
-                 analyses_run = True
-            else:
-                 print("No Memory files found in the given range.")
-                        
-            if selected_files_vmstat:
-                 run_vmstat_analysis(selected_files_vmstat, output_suffix, start_str, end_str)
-                 analyses_run = True
-            else:
-                 print("No VMStat files found in the given range.")
-                        
-            if selected_files_cpu:
-                     run_dstate_analysis(selected_files_cpu, output_suffix, start_str, end_str)
-                     analyses_run = True
-            else:
-                print("No OSWtop files found in the given range for D-state analysis.")
-                        
-            if selected_files_disk:
-                        run_disk_analysis(selected_files_disk, output_suffix, start_str, end_str)
-                        analyses_run = True
-            else:
-                 print("No Disk (iostat) files found in the given range.")
-                        
-            if selected_files_netstat:
-                      run_netstat_analysis(selected_files_netstat, output_suffix, start_str, end_str)
-                      analyses_run = True
-            else:
-                 print("No Netstat files found in the given range.")
-                    
-            if analyses_run:
-                      print("\nAll time-range analyses completed successfully!")
-            else:
-                print("\nNo files found in the given time range for any analysis type.")
-           
-        elif choice == "3":
+        if choice == "3":
             print(" Exiting.")
             break
-
+        if choice in MENU_ACTIONS:
+            MENU_ACTIONS[choice]()